@@ -5,12 +5,19 @@
 # LIBRARIES
 ############
 import sys
+import os
+import io
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-import random as rnd
-import matplotlib.pyplot as plt
+# matplotlib is imported by the drawing functions, which are only used in verbose mode, so that the rest of the runs do not
+# pay for its import
 import math
 from enum import Enum
 import numpy as np
+from numba import njit
+from scipy.spatial import cKDTree
 
 import csv
 
@@ -47,6 +54,23 @@ class SIMstatus(Enum):
     SS_UNREASONABLETIME = 3
 
 
+# String conversions of the enum types (see optMethod.AOTypeToStr, optMethod.PITypeToStr and optMethod.SIMStatusToStr)
+# The value that is missing in each of them is the one returned by default
+_AO_NAMES = {AOtypes.NONE:           "",
+             AOtypes.TNORMA_MIN:     "TNORMA_MIN",
+             AOtypes.TNORMA_MAX:     "TNORMA_MAX",
+             AOtypes.TNORMA_PRODUCT: "TNORMA_PRODUCT",
+             AOtypes.TNORMA_YAGER:   "TNORMA_YAGER",
+             AOtypes.HARMONIC_MEAN:  "HARMONIC_MEAN"}
+
+_PI_NAMES = {PItypes.PI_LINEAR:      "PI_LINEAR",
+             PItypes.PI_TRAPEZOIDAL: "PI_TRAPEZOIDAL",
+             PItypes.PI_GAUSSIAN:    "PI_GAUSSIAN"}
+
+_SS_NAMES = {SIMstatus.SS_INPROGRESS:       "SS_INPROGRESS",
+             SIMstatus.SS_SUCCESSFULENDING: "SS_SUCCESSFULENDING"}
+
+
 ##################
 # GLOBAL SETTINGS
 ##################
@@ -143,6 +167,177 @@ __AOtypes__ = [[AOtypes.TNORMA_MIN, AOtypes.TNORMA_MAX], [AOtypes.TNORMA_PRODUCT
 __AOparams__    = [[[None]], [[None]], [[None]], [[1.00], [0.75], [0.50]]] # In case __PhysicalInterference__ is False
 __AOparams_PI__ = [[[None]], [[None]], [[None]], [[1.00], [0.75], [0.50]]] # In case __PhysicalInterference__ is True
 
+# Smallest value returned by the Fuzzy Sets (FS) modeling the stimuli
+FS_EPSILON = sys.float_info.epsilon
+
+
+##################
+# NUMERIC KERNELS
+##################
+# The stimuli are computed by the following functions; the ones decorated with @njit are compiled by Numba
+# The enum types are passed as their integer values, and the missing parameters as NaN (see Agents.stimulusParams)
+# The times are rounded up from divisions by the velocity and the work capacity of the agents. These divisions must not
+# be replaced by multiplications by their inverses: e.g. 525 * (1/75) is slightly greater than 7, so ceil would give 8
+
+# Computes the part of the Stimulus (St) which is related to "Deadlines" (DL), and the Utility (Ut) function
+# dl007 is 0.07 times the deadline, which is precomputed for each task
+@njit(cache=True)
+def _stut_function(rET, dl, dl007, maxU, tij, curTime, wrkcap):
+    expectedTaskjEnd = curTime + tij + math.ceil(rET / wrkcap)
+
+    if (expectedTaskjEnd <= dl):
+        stimulus = maxU * (dl / ((dl - expectedTaskjEnd) + dl))
+        utility  = maxU
+    else:
+        stimulus = maxU * (dl007 / ((expectedTaskjEnd - dl) + dl007))
+        utility  = stimulus
+
+    return(stimulus, utility)
+
+
+# Computes the part of the Stimulus (St) which is related to "Physical Interference" (PI)
+# The type of PI is resolved beforehand into the slope and the intercept of the line (see Agents.resolveStimulusParams)
+@njit(cache=True)
+def _st_pi(PIslope, PIcurAparam, PIintercept):
+    return(max((PIslope * PIcurAparam) + PIintercept, 0.00))
+
+
+# Integer values of the Aggregation Operators (AO), which Numba compiles into the kernels as constants
+_AO_TNORMA_MIN     = AOtypes.TNORMA_MIN.value
+_AO_TNORMA_MAX     = AOtypes.TNORMA_MAX.value
+_AO_TNORMA_PRODUCT = AOtypes.TNORMA_PRODUCT.value
+_AO_TNORMA_YAGER   = AOtypes.TNORMA_YAGER.value
+_AO_HARMONIC_MEAN  = AOtypes.HARMONIC_MEAN.value
+
+
+# Combines the x and y data values by applying an Aggregation Operator (AO)
+# The AO is given by its integer value, which is constant during the simulation, so the branch taken is always the same
+@njit(cache=True)
+def _do_aggregation(AOtype, param1, x, y):
+    if (AOtype == _AO_TNORMA_MIN):
+        return(min(x, y))
+
+    elif (AOtype == _AO_TNORMA_MAX):
+        return(max(x, y))
+
+    elif (AOtype == _AO_TNORMA_PRODUCT):
+        return(x * y)
+
+    elif (AOtype == _AO_TNORMA_YAGER):
+        # param1 = lamda; param1 > 0
+        # In case param1 is equal to 1, TNORMA_LUKASIEWICZ
+        return(max(0.00, 1 - ((((1-x) ** param1) + ((1-y) ** param1)) ** (1/param1))))
+
+    elif (AOtype == _AO_HARMONIC_MEAN):
+        if ((x == 0.00) or (y == 0.00)):
+            return(0.00)
+        else:
+            return(2 / ((1/x) + (1/y)))
+
+    else: # AOtypes.OWA_OPERATOR
+        # param1 = max(wmax, 1-wmax); 0 <= wmax <= 1
+        if ((x == 0.00) or (y == 0.00)):
+            return(0.00)
+        else:
+            return((param1 * max(x, y)) + ((1 - param1) * min(x, y)))
+
+
+# Computes the Euclidean distances between the points a_xy (N,2) and the points t_xy (M,2); returns an (N,M) array
+def _pairwise_dist(a_xy, t_xy):
+    return(np.sqrt(((a_xy[:, None, :] - t_xy[None, :, :]) ** 2).sum(-1)))
+
+
+# Same as math.isclose with its default tolerances
+@njit(cache=True)
+def _is_close(a, b):
+    if (a == b):
+        return(True)
+    diff = abs(b - a)
+    return((diff <= abs(1e-09 * b)) or (diff <= abs(1e-09 * a)))
+
+
+# Looks for the task that needs to be done most urgently by an agent whose distances to the tasks are dist
+# The tasks are scanned in the given order, and the first task getting the highest stimulus is the best one. However, if
+# the destination task of the agent (destTask) is found after it with a close stimulus, the agent keeps its destination
+# Returns the best task and the travelling time to it; the best task is -1 if no task can be chosen
+@njit(cache=True)
+def _best_task_kernel(dist, rET, dl, dl007, maxU, agentsInTask, order, curTime, vel, wrkcap, curTask, destTask,
+                      IN, INk, PI, PIslope, PIintercept, AO0, AO1, AOparam):
+    bestj    = -1
+    sbestj   = -1.00
+    tbestj   =  0
+    destTied = False
+    tdestj   =  0
+
+    for j in order:
+        if (rET[j] > 0):
+            tij = math.ceil(dist[j] / vel)
+
+            st, ut = _stut_function(rET[j], dl[j], dl007[j], maxU[j], tij, curTime, wrkcap) # Here, it is assumed that the agent is located at taski
+            if (PI):
+                st = _do_aggregation(AO0, AOparam, st, _st_pi(PIslope[j], agentsInTask[j], PIintercept))
+
+            if (IN):
+                st = _do_aggregation(AO1, np.nan, st, INk if (j == curTask) else 0.00)
+
+            if (st != 0.00):
+                if (st > sbestj):
+                    bestj    = j
+                    sbestj   = st
+                    tbestj   = tij
+                    destTied = False
+                elif ((j == destTask) and _is_close(st, sbestj)):
+                    destTied = True
+                    tdestj   = tij
+
+    if (destTied):
+        return(destTask, tdestj)
+
+    return(bestj, tbestj)
+
+
+# Returns, in a single pass over the tasks, the average percentage of the utilities achieved by the tasks with respect to
+# their maximum utilities, and the average amount of time the tasks were completed before their deadlines
+# The tasks are summed up one after another, so the result is the same as the one of a Python loop
+@njit(cache=True)
+def _avg_achievements(achU, maxU, dl, ITC):
+    sumachUPCT = 0.00
+    sumachTBDL = 0
+    for j in range(achU.shape[0]):
+        sumachUPCT = sumachUPCT + ((achU[j] / maxU[j]) * 100) # 0 in case the task has not been completed
+        sumachTBDL = sumachTBDL + (dl[j] - ITC[j])
+
+    return(sumachUPCT / achU.shape[0], sumachTBDL / achU.shape[0])
+
+
+###################
+# OUTPUT FUNCTIONS
+###################
+
+# Formats a number with the given format specification, writing a comma as the decimal separator
+_DECIMAL_COMMA = str.maketrans(".", ",")
+def _fmt(x, spec):
+    return(format(x, spec).translate(_DECIMAL_COMMA))
+
+
+####################
+# DRAWING FUNCTIONS
+####################
+
+# Draws a set of circles, given the (X,Y)-positions of their centers, their radius and their colors, as a single collection
+# instead of one artist per circle. The radius are in data units, as the ones of plt.Circle
+def drawCircles(plot, centersXY, radius, colors):
+    from matplotlib.collections import EllipseCollection
+
+    if (len(centersXY) == 0):
+        return(None)
+
+    diameters = 2 * np.asarray(radius, dtype=float)
+    circles   = EllipseCollection(diameters, diameters, 0, units='xy', offsets=centersXY, offset_transform=plot.transData, facecolors=colors, edgecolors=colors)
+    plot.add_collection(circles, autolim=False)
+    return(circles)
+
+
 #######################
 # AGENT MOVEMENT CLASS
 #######################
@@ -156,6 +351,7 @@ class AgentMovement:
     # arrivaltime        -> time of arrival to the destination task
     # finalagentposition -> position of the destination task    
     # destinationtask    -> internal identifier of the destination task
+    __slots__ = ('decisiontakenat', 'arrivaltime', 'initialagentposition', 'finalagentposition', 'destinationtask')
 
 
     # METHODS: Constructor
@@ -178,6 +374,9 @@ class Agent:
     # wrkcap  -> How much work can be done by the agent on one task during one unit of time?
     # wrkdone -> Total work done by the agent on tasks
     # mov     -> list of movements made by the agent
+    # closedDst -> distance travelled in all the movements but the last one, which is the only one that can still change
+    # cachedPosTime -> instant of time for which the current position of the agent has been cached
+    # cachedPos     -> cached current position of the agent
 
 
     # METHODS:
@@ -188,6 +387,9 @@ class Agent:
         self.wrkcap  = wrkcap
         self.wrkdone = 0
         self.mov     = []
+        self.closedDst     = 0
+        self.cachedPosTime = None
+        self.cachedPos     = None
         if (initialpos is None):
             # The agent is initially on a task
             self.mov.append(AgentMovement(0, 0, firsttask.pos, firsttask.pos, firsttask.id))
@@ -202,91 +404,45 @@ class Agent:
     def changeTask(self, departureTime, arrivalTime, initialPosition, finalPosition, destinationTask):
         lastmov = self.mov[-1]
         lastmov.finalagentposition = initialPosition
+        self.closedDst = self.closedDst + lastmov.initialagentposition.getDistanceTo(lastmov.finalagentposition)
         self.mov.append(AgentMovement(departureTime, arrivalTime, initialPosition, finalPosition, destinationTask))
+        self.cachedPosTime = None
 
 
     # When all tasks have been completed, the agent should be stopped
     def stop(self, curTime):
         lastmov = self.mov[-1]
         lastmov.finalagentposition = self.getCurrentPosition(curTime)
+        self.cachedPosTime = None
 
 
     # Computes the total distance travelled by the agent
     def getTravelledDistance(self):
-        dst = 0
-        for onemov in self.mov:
-            dst = dst + onemov.initialagentposition.getDistanceTo(onemov.finalagentposition)
-
-        return(dst)
-
-
-    # The agent does some work at the task where is currently located
-    def doTaskWork(self, tasks, curTime):
-        idtask = self.getCurrentTask(curTime)
-        if (idtask is not None):
-            task = tasks.ltasks[idtask]
-
-            updrET = max(task.rET - self.wrkcap, 0)
-            wrkdone = task.rET - updrET
-            self.wrkdone = self.wrkdone + wrkdone
-            task.rET = updrET
-
-            if (task.isCompleted() and wrkdone > 0):
-                self.calcAchievedTaskUtility(task, curTime)
-                task.ITC = curTime
+        lastmov = self.mov[-1]
+        return(self.closedDst + lastmov.initialagentposition.getDistanceTo(lastmov.finalagentposition))
 
 
     # Which task needs to be done most urgently?
-    def getBestTaskToMove(self, agents, tasks, curTime, IN, INparamset, PI, PItype, PIparamset, changeTWT, AOtypeset, AOparamset, realexpMode):
-        bestTask  = None
-        sbestTask = -1
+    def getBestTaskToMove(self, agents, agentsInTask, tasksDist, tasks, curTime, changeTWT, realexpMode):
+        bestTask  = -1
         tbestTask =  0
-        lbestTask = [[bestTask, tbestTask]]
 
         if ((not self.isTravelling(curTime)) or (self.isTravelling(curTime) and changeTWT)):
-            posi = self.getCurrentPosition(curTime)
+            numTasks = len(tasks.ltasks)
 
             if (not realexpMode):
-                shuffledltasks = rnd.sample(tasks.ltasks, k=len(tasks.ltasks))
+                order = agents.rng.permutation(numTasks)
             else:
-                shuffledltasks = tasks.ltasks
-
-            for taskj in shuffledltasks:
-                if (not taskj.isCompleted()):
-                    sTask, tTask = self.getTaskStimulus(posi, taskj, agents.getNumberOfAgentsInTask(taskj.id), curTime, IN, INparamset, PI, PItype, PIparamset, AOtypeset, AOparamset)
-                    if ((sTask is not None) and (not (sTask.is_integer() and sTask == 0))):
-                        if (sTask > sbestTask):
-                            bestTask  = taskj.id
-                            sbestTask = sTask
-                            tbestTask = tTask
-                            lbestTask = [[bestTask, tbestTask]]
-                        elif (math.isclose(sTask, sbestTask)):
-                            lbestTask.append([taskj.id, tTask])
-
-        # Is the agent's current task in the list?
-        curTask = self.getDestinationTask()
-        for taskj in lbestTask:
-            if ((taskj[0] is not None) and (taskj[0] == curTask)):
-                return(taskj)
-
-        return(lbestTask[0])
-
-
-    # Computes the stimulus, i.e. the urgency for moving the agent to a given task (taskj) at the current time instant
-    def getTaskStimulus(self, posi, taskj, taskjcurA, curTime, IN, INparamset, PI, PItype, PIparamset, AOtypeset, AOparamset):
-        tij = 0
-        if ((posi.X != taskj.pos.X) or (posi.Y != taskj.pos.Y)):
-            dij = posi.getDistanceTo(taskj.pos)
-            tij = self.getTravellingTime(dij)
-            
-        st, ut = self.StUtFunction(taskj, tij, curTime) # Here, it is assumed that the agent is located at taski
-        if (PI):
-            st = self.doAggregation(AOtypeset[0], AOparamset, st, self.getStPI(PItype, taskjcurA, taskj.maxA, PIparamset[0], PIparamset[1]))
+                order = np.arange(numTasks)
 
-        if (IN):
-            st = self.doAggregation(AOtypeset[1], [None], st, self.getStIN(self.getCurrentTask(curTime), taskj.id, INparamset[0]))
+            curTask = self.getCurrentTask(curTime)
+            bestTask, tbestTask = _best_task_kernel(tasksDist, tasks.rET, tasks.dl, tasks.dl007, tasks.maxU, agentsInTask, order, curTime, self.vel, self.wrkcap,
+                                                    -1 if (curTask is None) else curTask, self.getDestinationTask(), *agents.stimulusParams)
+
+        if (bestTask < 0):
+            return([None, 0])
 
-        return(st, tij)
+        return([bestTask, tbestTask])
 
 
     # Computes the part of the Stimulus (St) which is related to "Travelling Time" (TT)
@@ -294,30 +450,6 @@ class Agent:
         return(self.travellingtimeFS(tij / rETj))
 
 
-    # Computes the part of the Stimulus (St) which is related to "Physical Interference" (PI)
-    def getStPI(self, PItype, PIcurAparam, PImaxAparam, PIGammaparam, PIBetaparam):
-
-        if (PItype is PItypes.PI_LINEAR):
-            return(max((((PIGammaparam - PIBetaparam) / PImaxAparam) * PIcurAparam) + PIBetaparam, 0.00))
-
-        elif (PItype is PItypes.PI_TRAPEZOIDAL):
-            return(0.00)
-
-        elif (PItype is PItypes.PI_GAUSSIAN):
-            return(0.00)
-
-        else: # PItypes.PI_EXPONENTIAL
-            return(0.00)
-
-
-    # Computes the part of the Stimulus (St) which is related to "Inertia" (IN)
-    def getStIN(self, curTask, idj, k):
-        if ((curTask is not None) and (curTask == idj)):
-            return(k)
-        else:
-            return(0.00)
-
-
     # It is assumed that the agent has just completed a given task (taskj).
     # Calculates the utility/reward that has been obtained for completing such a task.
     def calcAchievedTaskUtility(self, taskj, curTime):
@@ -327,64 +459,17 @@ class Agent:
 
     # Computes the part of the Stimulus (St) which is related to "Deadlines" (DL), and the Utility (Ut) function
     def StUtFunction(self, taskj, tij, curTime):
-        stimulus = None
-        utility  = None
-        expectedTaskjEnd = curTime + tij + math.ceil(taskj.rET / self.wrkcap)
-
-        if (expectedTaskjEnd <= taskj.dl):
-            stimulus = taskj.maxU * ((1.00 * taskj.dl) / ((taskj.dl - expectedTaskjEnd) + (1.00 * taskj.dl)))
-            utility  = taskj.maxU
-        else:
-            stimulus = taskj.maxU * ((0.07 * taskj.dl) / ((expectedTaskjEnd - taskj.dl) + (0.07 * taskj.dl)))
-            utility  = stimulus
-
-        return(stimulus, utility)
+        return(_stut_function(taskj.rET, taskj.dl, taskj.dl007, taskj.maxU, tij, curTime, self.wrkcap))
 
 
     # Implementation of a Fuzzy Set (FS) which takes the travelling time into account
     def travellingtimeFS(self, x, n = 1):
         if (x >= 1):
-            return(sys.float_info.epsilon)
-        else:
-            return(max(1 - math.pow(x, n), sys.float_info.epsilon))
-
-
-    # Combines the x, y and z data values by applying an Aggregation Operator (AO)
-    def doAggregation(self, AOtype, AOparamset, x, y, z = None):
-
-        if ((x is None) or (y is None)):
-            return(None)
-
-        param1 = AOparamset[0]
-
-        if (AOtype is AOtypes.TNORMA_MIN):
-            return(min(x, y))
-
-        elif (AOtype is AOtypes.TNORMA_MAX):
-            return(max(x, y))
-
-        elif (AOtype is AOtypes.TNORMA_PRODUCT):
-            return(x * y)
-
-        elif (AOtype is AOtypes.TNORMA_YAGER):
-            # param1 = lamda; param1 > 0
-            # In case param1 is equal to 1, TNORMA_LUKASIEWICZ
-            return(max(0.00, 1 - math.pow(math.pow(1-x, param1) + math.pow(1-y, param1), 1/param1)))
-
-        elif (AOtype is AOtypes.HARMONIC_MEAN):
-            if ((x.is_integer() and x == 0) or (y.is_integer() and y == 0)):
-                return(0.00)
-            else:
-                return(2 / ((1/x) + (1/y)))
-
+            return(FS_EPSILON)
+        elif (n == 1):
+            return(max(1 - x, FS_EPSILON))
         else:
-            # AOtypes.OWA_OPERATOR
-            # param1 = wmax; 0 <= param1 <= 1
-            if ((x.is_integer() and x == 0) or (y.is_integer() and y == 0)):
-                return(0.00)
-            else:
-                aux = max(param1, (1-param1))
-                return((aux * max(x, y)) + ((1 - aux) * min(x, y)))
+            return(max(1 - (x ** n), FS_EPSILON))
 
 
     # Is the agent currently moving from one task to another?
@@ -411,7 +496,11 @@ class Agent:
 
 
     # Returns the current position of the agent
+    # The position is computed once per instant of time; changing the movements of the agent discards it
     def getCurrentPosition(self, curTime):
+        if (curTime == self.cachedPosTime):
+            return(self.cachedPos)
+
         lastmov = self.mov[-1]
         if (self.isTravelling(curTime)):
 
@@ -421,9 +510,13 @@ class Agent:
 
             X = lastmov.initialagentposition.X + ((lastmov.finalagentposition.X - lastmov.initialagentposition.X) * u)
             Y = lastmov.initialagentposition.Y + ((lastmov.finalagentposition.Y - lastmov.initialagentposition.Y) * u)
-            return(XYtuple(X, Y))
+            pos = XYtuple(X, Y)
         else:
-            return(lastmov.finalagentposition)
+            pos = lastmov.finalagentposition
+
+        self.cachedPosTime = curTime
+        self.cachedPos     = pos
+        return(pos)
 
 
     # Returns the internal identifier of the task to which the agent is currently moving
@@ -464,10 +557,15 @@ class Agents:
     # AOtypeset   -> pair of Aggregator Operators (AO) to be applied
     # AOparamset  -> values for the set of parameters of the Aggregation Operator (AO)
     # realexpMode -> if True, agents behave as they would in the real experiments carried out by Toni/Alberto
+    # rng         -> random number generator used to create the agents, and to shuffle the agents and the tasks
+    # stimulusParams -> settings of the stimuli (St) resolved into the values expected by _best_task_kernel
+    # pos_xy      -> (X,Y)-positions of the agents at the current time instant, indexed by the internal identifier of the agents
+    # agentsInTask -> number of agents that are going to/located in each task; it is updated whenever an agent changes its destination
+    # wrkcap      -> work capacities of the agents, indexed by the internal identifier of the agents
 
     # METHODS
     # Constructor   
-    def __init__(self, numAgents, envSize, minAgentVel, minAgentWrkCap, maxAgentWrkCap, iniAgentPosX, iniAgentPosY, tasks, IN, INparamset, PI, PItype, PIparamset, changeTWT, AOtypeset, AOparamset, realexpMode):
+    def __init__(self, numAgents, envSize, minAgentVel, minAgentWrkCap, maxAgentWrkCap, iniAgentPosX, iniAgentPosY, tasks, IN, INparamset, PI, PItype, PIparamset, changeTWT, AOtypeset, AOparamset, realexpMode, rng):
         self.IN          = IN
         self.INparamset  = INparamset
         self.PI          = PI
@@ -477,6 +575,8 @@ class Agents:
         self.AOtypeset   = AOtypeset
         self.AOparamset  = AOparamset
         self.realexpMode = realexpMode
+        self.rng         = rng
+        self.resolveStimulusParams(tasks)
         self.createAgents(numAgents, envSize, minAgentVel, minAgentWrkCap, maxAgentWrkCap, iniAgentPosX, iniAgentPosY, tasks)
 
 
@@ -485,14 +585,16 @@ class Agents:
 
         self.lagents = []
         numTasks = len(tasks.ltasks)
-        taskass  = rnd.sample(range(numTasks), numAgents) # It generates random values without duplicates
-                                                          # This means that, at most, there will be one agent assigned to a given task
+        self.pos_xy  = np.empty((numAgents, 2))
+        taskass  = self.rng.choice(numTasks, size=numAgents, replace=False).tolist() # It generates random values without duplicates
+                                                                                    # This means that, at most, there will be one agent assigned to a given task
 
         maxvelocity = math.ceil(tasks.getMinDistance2Tasks() / 1.25) # We impose a travelling time of, at least, 2 units of time
                                                                      # The divisor can take a value in the range (1, 2]
         minvelocity = math.ceil(maxvelocity * minAgentVel)
-        velass    = rnd.choices(range(minvelocity,    maxvelocity+1),    k = numAgents) # It generates random values with duplicates
-        wrkcapass = rnd.choices(range(minAgentWrkCap, maxAgentWrkCap+1), k = numAgents)
+        velass    = self.rng.integers(minvelocity,    maxvelocity+1,    size=numAgents).tolist() # It generates random values with duplicates
+        wrkcapass = self.rng.integers(minAgentWrkCap, maxAgentWrkCap+1, size=numAgents).tolist()
+        self.wrkcap = np.array(wrkcapass)
 
         for i in range(numAgents):
             if ((iniAgentPosX is None) or (iniAgentPosY is None)):
@@ -500,6 +602,36 @@ class Agents:
             else:
                 self.lagents.append(Agent(i, velass[i], wrkcapass[i], XYtuple(iniAgentPosX, iniAgentPosY), tasks.ltasks[taskass[i]]))
 
+        destTasks = np.fromiter((agent.getDestinationTask() for agent in self.lagents), dtype=np.int64, count=numAgents)
+        self.agentsInTask = np.bincount(destTasks, minlength=numTasks)
+
+
+    # The settings of the stimuli (St) do not change during the simulation, so the types and parameters of the modeling
+    # functions and the Aggregation Operators (AO) are resolved only once
+    # The PI of PItypes.PI_LINEAR is a line for each task, whose slope depends on the maximum number of agents of the task;
+    # the rest of PItypes are not implemented yet and give a PI of 0, which is the line with slope and intercept 0
+    def resolveStimulusParams(self, tasks):
+        INk     = 0.00 if (self.INparamset[0] is None) else float(self.INparamset[0])
+        PIgamma = 0.00 if (self.PIparamset[0] is None) else float(self.PIparamset[0])
+        PIbeta  = 0.00 if (self.PIparamset[1] is None) else float(self.PIparamset[1])
+        if (self.PItype is PItypes.PI_LINEAR):
+            PIslope     = (PIgamma - PIbeta) / tasks.maxA
+            PIintercept = PIbeta
+        else:
+            PIslope     = np.zeros(len(tasks.ltasks))
+            PIintercept = 0.00
+        AO0code = AOtypes.NONE.value if (self.AOtypeset[0] is None) else self.AOtypeset[0].value
+        AO1code = AOtypes.NONE.value if (self.AOtypeset[1] is None) else self.AOtypeset[1].value
+
+        if (self.AOparamset[0] is None):
+            AOparam = np.nan
+        elif (self.AOtypeset[0] is AOtypes.OWA_OPERATOR):
+            AOparam = float(max(self.AOparamset[0], (1-self.AOparamset[0])))
+        else:
+            AOparam = float(self.AOparamset[0])
+
+        self.stimulusParams = (self.IN, INk, self.PI, PIslope, PIintercept, AO0code, AO1code, AOparam)
+
 
     # Prints some data of interest about the agents
     def printAgents(self, withmovs):
@@ -529,25 +661,50 @@ class Agents:
 
 
     # Each agent does some work at the task where is located
+    # The work of all the agents is subtracted at once from the remaining execution times of the tasks. However, the agents
+    # working at a task that gets completed share out the work that was left in their order, and the one that completes
+    # the task computes its achieved utility
     def doAgentsWork(self, tasks, curTime):
-        for agent in self.lagents:
-            agent.doTaskWork(tasks, curTime)
+        curTasks = np.fromiter(((-1 if (idtask is None) else idtask) for idtask in (agent.getCurrentTask(curTime) for agent in self.lagents)), dtype=np.int64, count=len(self.lagents))
+        working  = (curTasks >= 0)
+        work     = np.bincount(curTasks[working], weights=self.wrkcap[working], minlength=len(tasks.ltasks))
+
+        leftrET = tasks.rET.tolist()
+        tasks.rET[:] = np.maximum(tasks.rET - work, 0)
+
+        for agent, idtask in zip(self.lagents, curTasks.tolist()):
+            if (idtask >= 0):
+                wrkdone = min(agent.wrkcap, leftrET[idtask])
+                leftrET[idtask] = leftrET[idtask] - wrkdone
+                agent.wrkdone = agent.wrkdone + wrkdone
+
+                if ((leftrET[idtask] == 0) and (wrkdone > 0)):
+                    task = tasks.ltasks[idtask]
+                    agent.calcAchievedTaskUtility(task, curTime)
+                    tasks.setTaskCompleted(idtask, curTime)
 
 
     # Each agent is moved to the task which provides the highest utility
     def moveAgents(self, tasks, curTime):
+        numAgents = len(self.lagents)
         if (not self.realexpMode):
-            shuffledlagents = rnd.sample(self.lagents, k=len(self.lagents))
+            order = self.rng.permutation(numAgents)
         else:
-            ireorder = curTime % len(self.lagents)
-            if (ireorder == 0):
-                shuffledlagents = self.lagents
-            else:
-                shuffledlagents = self.lagents[ireorder:] + self.lagents[0:ireorder]
+            order = (np.arange(numAgents) + (curTime % numAgents)) % numAgents
 
-        for agent in shuffledlagents:
-            bestTask = agent.getBestTaskToMove(self, tasks, curTime, self.IN, self.INparamset, self.PI, self.PItype, self.PIparamset, self.changeTWT, self.AOtypeset, self.AOparamset, self.realexpMode)
+        # Distances from each agent to each task; deciding where to go does not change the current position of an agent
+        for agent in self.lagents:
+            agentPos = agent.getCurrentPosition(curTime)
+            self.pos_xy[agent.id, 0] = agentPos.X
+            self.pos_xy[agent.id, 1] = agentPos.Y
+        tasksDist = _pairwise_dist(self.pos_xy, tasks.pos_xy)
+
+        for i in order:
+            agent = self.lagents[i]
+            bestTask = agent.getBestTaskToMove(self, self.agentsInTask, tasksDist[agent.id], tasks, curTime, self.changeTWT, self.realexpMode)
             if (bestTask[0] is not None):
+                self.agentsInTask[agent.getDestinationTask()] -= 1
+                self.agentsInTask[bestTask[0]] += 1
                 agent.changeTask(curTime, curTime+bestTask[1], agent.getCurrentPosition(curTime), tasks.ltasks[bestTask[0]].pos, bestTask[0])
 
 
@@ -559,35 +716,30 @@ class Agents:
 
     # Returns the average distance travelled by the agents
     def getAchievedTravelledDST(self):
-        dst = 0
-        for agent in self.lagents:
-            dst = dst + agent.getTravelledDistance();
-
-        return(dst / len(self.lagents))
+        return(sum(agent.getTravelledDistance() for agent in self.lagents) / len(self.lagents))
 
 
     # Returns the total work done by agents
     def getWorkDone(self):
-        totalW = 0
-        for agent in self.lagents:
-            totalW = totalW + agent.wrkdone
-
-        return(totalW)
+        return(sum(agent.wrkdone for agent in self.lagents))
 
 
     # Returns the number of agents that are going to/located in a task
     def getNumberOfAgentsInTask(self, idTask):
-        numAgents = 0
-        for agent in self.lagents:
-            if (agent.getDestinationTask() == idTask):
-                numAgents = numAgents + 1
-
-        return(numAgents)
+        return(int(self.agentsInTask[idTask]))
 
 
     # Draws the list of agents which are currently located at each task
     def drawAgents(self, plot, fs, tasks, curTime):
+        agentsCurTask = [agent.getCurrentTask(curTime)     for agent in self.lagents]
+        agentsComTask = [agent.getForthComingTask(curTime) for agent in self.lagents]
+
         lbls = []
+        ringsXY    = []
+        outerRadius = []
+        outerColor = []
+        innerRadius = []
+        innerColor = []
         for task in tasks:
 
             nagentsLoc = 0
@@ -595,10 +747,7 @@ class Agents:
             lblLoc = ""
             lblTrv = ""
 
-            for agent in self.lagents:
-                curTask = agent.getCurrentTask(curTime)
-                comTask = agent.getForthComingTask(curTime)
-
+            for agent, curTask, comTask in zip(self.lagents, agentsCurTask, agentsComTask):
                 if ((curTask is not None) and (curTask == task.id)):
                     if (nagentsLoc):
                         lblLoc = lblLoc + "-" + "A" + str(agent.id) + "(" + str(agent.wrkcap) + "/" + str(agent.wrkdone) + ")"
@@ -615,12 +764,15 @@ class Agents:
                     nagentsTrv = nagentsTrv + 1
 
             if ((nagentsLoc + nagentsTrv) > 0):
+                ringsXY.append((task.pos.X, task.pos.Y))
+                outerRadius.append(2.5*(nagentsLoc+nagentsTrv+1))
+                innerRadius.append(2.5*(nagentsLoc+1))
                 if (not task.isCompleted()):
-                    plot.add_artist(plt.Circle((task.pos.X, task.pos.Y), radius=2.5*(nagentsLoc+nagentsTrv+1), color='green'))
-                    plot.add_artist(plt.Circle((task.pos.X, task.pos.Y), radius=2.5*(nagentsLoc+1), color='red'))
+                    outerColor.append('green')
+                    innerColor.append('red')
                 else:
-                    plot.add_artist(plt.Circle((task.pos.X, task.pos.Y), radius=2.5*(nagentsLoc+nagentsTrv+1), color='black'))
-                    plot.add_artist(plt.Circle((task.pos.X, task.pos.Y), radius=2.5*(nagentsLoc+1), color='black'))
+                    outerColor.append('black')
+                    innerColor.append('black')
 
             if (not task.isCompleted()):
                 taskinfoinbrackets = str(task.dl) + "/" + str(task.rET)
@@ -636,15 +788,28 @@ class Agents:
             else:
                 lbls.append("T" + str(task.id) + " [" + taskinfoinbrackets + "]")
 
+        # The outer circles go first, so that the inner ones are drawn over them
+        drawCircles(plot, ringsXY + ringsXY, outerRadius + innerRadius, outerColor + innerColor)
+
+        # Each travelling agent is drawn as a circle with an arrow pointing to its destination task: the first third of the
+        # way is a filled arrow, and the rest is an outlined one. The arrows are drawn as two quivers in data units
+        travellingXY = []
+        travellingUV = []
         for agent in self.lagents:
             if (agent.isTravelling(curTime)):
                 agentPos = agent.getCurrentPosition(curTime)
-                plot.add_artist(plt.Circle((agentPos.X, agentPos.Y), radius=2.5, color='green'))
-                taskPos = tasks[agent.getForthComingTask(curTime)].pos
-                plot.arrow(agentPos.X + ((taskPos.X-agentPos.X)/3), agentPos.Y + ((taskPos.Y-agentPos.Y)/3), (taskPos.X-agentPos.X)*(2/3), (taskPos.Y-agentPos.Y)*(2/3), width=1.0, facecolor='none', edgecolor='green')
-                plot.arrow(agentPos.X, agentPos.Y, (taskPos.X-agentPos.X)/3, (taskPos.Y-agentPos.Y)/3, width=1.0, head_width=20.0, head_length=10.0, length_includes_head=False, facecolor='green', edgecolor='green')
+                taskPos  = tasks[agent.getForthComingTask(curTime)].pos
+                travellingXY.append((agentPos.X, agentPos.Y))
+                travellingUV.append((taskPos.X-agentPos.X, taskPos.Y-agentPos.Y))
                 plot.text(agentPos.X, agentPos.Y+1.5*fs, "A" + str(agent.id), color='olive', fontsize=fs, horizontalalignment='center', verticalalignment='center')
 
+        if (travellingXY):
+            XY = np.array(travellingXY)
+            UV = np.array(travellingUV)
+            drawCircles(plot, XY, np.full(len(XY), 2.5), 'green')
+            plot.quiver(XY[:,0] + (UV[:,0]/3), XY[:,1] + (UV[:,1]/3), UV[:,0]*(2/3), UV[:,1]*(2/3), angles='xy', scale_units='xy', scale=1, units='xy', width=1.0, headwidth=3.0, headlength=4.5, headaxislength=4.5, facecolor='none', edgecolor='green', linewidth=1.0)
+            plot.quiver(XY[:,0], XY[:,1], UV[:,0]/3, UV[:,1]/3, angles='xy', scale_units='xy', scale=1, units='xy', width=1.0, headwidth=20.0, headlength=10.0, headaxislength=10.0, color='green', edgecolor='green', linewidth=1.0)
+
         return(lbls)
 
 
@@ -656,7 +821,8 @@ class XYtuple:
     # ATTRIBUTES
     # X -> X coordinate
     # Y -> Y coordinate
-    
+    __slots__ = ('X', 'Y')
+
     # METHODS: Constructor        
     def __init__(self, X, Y):
         self.X = X
@@ -674,28 +840,87 @@ class XYtuple:
 class Task:
 
     # ATTRIBUTES
-    # id   -> internal identifier of the task
-    # pos  -> (X,Y)-position of the task
-    # maxU -> maximum utility of the task
-    # achU -> achieved utility of the task
-    # ET   -> execution time to complete the task
-    # rET  -> remaining execution time to complete the task
-    # dl   -> deadline of the task
+    # id    -> internal identifier of the task
+    # pos   -> (X,Y)-position of the task
+    # tasks -> set of tasks the task belongs to
+    __slots__ = ('id', 'pos', 'tasks')
+
+    # The rest of the data of the task is kept by the set of tasks in parallel arrays (see Tasks), and accessed through:
+    # maxU  -> maximum utility of the task
+    # achU  -> achieved utility of the task
+    # ET    -> execution time to complete the task
+    # rET   -> remaining execution time to complete the task
+    # dl    -> deadline of the task
     # The condition dl >= ET should be satisfied
-    # ITC  -> instant of time in which the task has been completed
-    # maxA -> maximum number of agents that can simultaneously be in a task
+    # dl007 -> 0.07 times the deadline; it sets how fast the stimulus decreases once the deadline is exceeded
+    # ITC   -> instant of time in which the task has been completed
+    # maxA  -> maximum number of agents that can simultaneously be in a task
 
     # METHODS: Constructor
-    def __init__(self, id, pos, maxU, ET, dl, maxA):
-        self.id   = id
-        self.pos  = pos
-        self.maxU = maxU
-        self.achU = 0
-        self.ET   = ET
-        self.rET  = ET
-        self.dl   = dl
-        self.ITC  = -1
-        self.maxA = maxA
+    def __init__(self, id, pos, tasks):
+        self.id    = id
+        self.pos   = pos
+        self.tasks = tasks
+
+
+    # Returns the maximum utility of the task
+    @property
+    def maxU(self):
+        return(self.tasks.maxU[self.id])
+
+
+    # Returns the achieved utility of the task
+    @property
+    def achU(self):
+        return(self.tasks.achU[self.id])
+
+
+    # Sets the achieved utility of the task
+    @achU.setter
+    def achU(self, value):
+        self.tasks.achU[self.id] = value
+
+
+    # Returns the execution time to complete the task
+    @property
+    def ET(self):
+        return(self.tasks.ET[self.id])
+
+
+    # Returns the remaining execution time to complete the task
+    @property
+    def rET(self):
+        return(self.tasks.rET[self.id])
+
+
+    # Sets the remaining execution time to complete the task
+    @rET.setter
+    def rET(self, value):
+        self.tasks.rET[self.id] = value
+
+
+    # Returns the deadline of the task
+    @property
+    def dl(self):
+        return(self.tasks.dl[self.id])
+
+
+    # Returns 0.07 times the deadline of the task
+    @property
+    def dl007(self):
+        return(self.tasks.dl007[self.id])
+
+
+    # Returns the instant of time in which the task has been completed (see Tasks.setTaskCompleted)
+    @property
+    def ITC(self):
+        return(self.tasks.ITC[self.id])
+
+
+    # Returns the maximum number of agents that can simultaneously be in the task
+    @property
+    def maxA(self):
+        return(self.tasks.maxA[self.id])
 
 
     # Has the task been completed?
@@ -720,106 +945,135 @@ class Tasks:
 
     # ATTRIBUTES
     # esize  -> size of the environment
-    # ltasks -> list of tasks
+    # ltasks -> list of tasks, which are views of the following parallel arrays
+
+    # The data of the tasks is kept as parallel arrays indexed by the internal identifier of the tasks
+    # pos_xy -> (X,Y)-positions of the tasks, as an (N,2) array
+    # kdtree -> KD-tree over the positions of the tasks, which do not change after they are created
+    # ET     -> execution times of the tasks
+    # rET    -> remaining execution times of the tasks
+    # dl     -> deadlines of the tasks
+    # dl007  -> 0.07 times the deadlines of the tasks
+    # maxU   -> maximum utilities of the tasks
+    # maxA   -> maximum numbers of agents that can simultaneously be in the tasks
+    # achU   -> achieved utilities of the tasks
+    # ITC    -> instants of time in which the tasks have been completed
+
+    # numCompleted  -> number of tasks that have been completed
+    # dlOrder       -> internal identifiers of the tasks sorted by decreasing deadline
+    # farthestDLpos -> position in dlOrder of the task with the farthest deadline among the ones not completed yet
 
     # METHODS
     # Creates the tasks and assigns them a position, an utility, an execution time and a deadline randomly
-    def createTasks(self, numTasks, envSize, minDstBtwTasks, minTaskU, maxTaskU, minTaskET, maxTaskET, minTaskDL, maxTaskDL, maxAgentsPerTask):
+    def createTasks(self, numTasks, envSize, minDstBtwTasks, minTaskU, maxTaskU, minTaskET, maxTaskET, minTaskDL, maxTaskDL, maxAgentsPerTask, rng):
         self.esize  = envSize
-        self.ltasks = []
 
-        lposXY = self.distributeTasks(numTasks, envSize, minDstBtwTasks, 15)
-        for i in range(numTasks):
-            ET = rnd.randint(minTaskET, maxTaskET)
-            dl = round(ET * rnd.uniform(minTaskDL, maxTaskDL))
-            self.ltasks.append(Task(i, lposXY[i], rnd.uniform(minTaskU, maxTaskU), ET, dl, maxAgentsPerTask))
+        lposXY = self.distributeTasks(numTasks, envSize, minDstBtwTasks, 15, rng)
 
+        self.pos_xy = np.array([[posXY.X, posXY.Y] for posXY in lposXY], dtype=float)
+        self.kdtree = cKDTree(self.pos_xy)
+        self.ET     = rng.integers(minTaskET, maxTaskET+1, size=numTasks)
+        self.rET    = self.ET.copy()
+        self.dl     = np.round(self.ET * rng.uniform(minTaskDL, maxTaskDL, size=numTasks)).astype(np.int64) # Rounded half to even, as round
+        self.dl007  = 0.07 * self.dl
+        self.maxU   = rng.uniform(minTaskU, maxTaskU, size=numTasks)
+        self.maxA   = np.full(numTasks, maxAgentsPerTask)
+        self.achU   = np.zeros(numTasks)
+        self.ITC    = np.full(numTasks, -1)
+        self.ltasks = [Task(i, lposXY[i], self) for i in range(numTasks)]
 
-    # Computes a random location for each task; two tasks should be located a minimum of minDstBtwTasks apart
-    def distributeTasks(self, numTasks, envSize, minDstBtwTasks, margin):
-        lposXY = []
-        while (len(lposXY) < numTasks):
-            posXYaux = XYtuple(rnd.randint(margin, envSize.X-1-margin), rnd.randint(margin, envSize.Y-1-margin))
-
-            check = True
-            for posXY in lposXY:
-                if (posXYaux.getDistanceTo(posXY) < minDstBtwTasks):
-                    check = False
-
-            if (check):
-                lposXY.append(posXYaux)
-
-        return(lposXY)
-
-
-    # Returns the average utility/reward that was obtained when completing all the tasks
-    def getAchievedUtility(self):
-        sumachUPCT = 0
-
-        for task in self.ltasks:
-            achUPCT = task.getAchievedUtility()
-            sumachUPCT = sumachUPCT + achUPCT
-
-        return(sumachUPCT / len(self.ltasks))
-
-
-    # Returns the average amount of time tasks were completed before deadlines
-    def getAchievedTimeBeforeDL(self):
-        sumachTBDL = 0
+        self.numCompleted  = int(np.count_nonzero(self.rET <= 0))
+        self.dlOrder       = np.argsort(self.dl)[::-1].tolist()
+        self.farthestDLpos = 0
 
-        for task in self.ltasks:
-            achTBDL = task.getAchievedTimeBeforeDL()
-            sumachTBDL = sumachTBDL + achTBDL
 
-        return(sumachTBDL / len(self.ltasks))
+    # Computes a random location for each task; two tasks should be located a minimum of minDstBtwTasks apart
+    # The candidate locations are drawn in batches, and the ones that are far enough from the locations accepted in previous
+    # batches are accepted one after another, checking them against the ones accepted before in the same batch; the check
+    # stops at the first location that is too close
+    # The locations are integer, so the distances are compared squared and exactly
+    def distributeTasks(self, numTasks, envSize, minDstBtwTasks, margin, rng):
+        posXY    = np.empty((numTasks, 2), dtype=np.int64)
+        numPosXY = 0
+        minDst2  = minDstBtwTasks ** 2
+        while (numPosXY < numTasks):
+            candXY = np.column_stack((rng.integers(margin, envSize.X-margin, size=numTasks), rng.integers(margin, envSize.Y-margin, size=numTasks)))
+            dst2   = ((candXY[:, None, :] - posXY[None, :numPosXY, :]) ** 2).sum(axis=2)
+            candXY = candXY[(dst2 >= minDst2).all(axis=1)]
+
+            batchXY = []
+            for (X, Y) in candXY.tolist():
+                check = True
+                for (accX, accY) in batchXY:
+                    if ((((X-accX) ** 2) + ((Y-accY) ** 2)) < minDst2):
+                        check = False
+                        break
+
+                if (check):
+                    batchXY.append((X, Y))
+                    if ((numPosXY + len(batchXY)) == numTasks):
+                        break
+
+            if (batchXY):
+                posXY[numPosXY:numPosXY+len(batchXY)] = batchXY
+                numPosXY = numPosXY + len(batchXY)
+
+        return([XYtuple(int(X), int(Y)) for (X, Y) in posXY])
+
+
+    # Returns the average utility/reward that was obtained when completing all the tasks, and the average amount of time
+    # tasks were completed before deadlines
+    def getSummaryStats(self):
+        avgU, avgTbDL = _avg_achievements(self.achU, self.maxU, self.dl, self.ITC)
+        return(float(avgU), float(avgTbDL))
 
 
     # Tasks that have not been completed are forced to finish
     def finishTasks(self, lagents, curTime):
 
-        for task in self.ltasks:
-            if (not task.isCompleted()):
-                task.rET = 0
-                lagents[0].calcAchievedTaskUtility(task, curTime)
-                task.ITC = curTime
+        for idtask in np.flatnonzero(self.rET > 0).tolist():
+            task = self.ltasks[idtask]
+            task.rET = 0
+            lagents[0].calcAchievedTaskUtility(task, curTime)
+            self.setTaskCompleted(idtask, curTime)
+
+
+    # Records that a task has just been completed, i.e. its remaining execution time has just become 0
+    def setTaskCompleted(self, idTask, curTime):
+        self.ITC[idTask]  = curTime
+        self.numCompleted = self.numCompleted + 1
 
 
     # Prints some data of interest about the tasks
     def printTasks(self, withachU):
         print("**************\nTASKS\n**************\n")
         for task in self.ltasks:
-            print("TASK #" + str(task.id) + "\n\tposition: (" + str(task.pos.X) + ", " + str(task.pos.Y) + ")\n\tET:  " + str(task.ET) + "\n\trET: " + str(task.rET) + "\n\tDL:  " + str(task.ET) + " + " + str(task.dl - task.ET) + "\n\tmaxA: " + str(task.maxA) + "\n\tmaxU: " + str(task.maxU), end='')
+            print(f"TASK #{task.id}\n\tposition: ({task.pos.X}, {task.pos.Y})\n\tET:  {task.ET}\n\trET: {task.rET}\n\tDL:  {task.ET} + {task.dl - task.ET}\n\tmaxA: {task.maxA}\n\tmaxU: {task.maxU}", end='')
             if (withachU):
-                print("\n\tachU: " + str(task.achU) + "\n\tachU (%): " + str(format(task.getAchievedUtility(),".2f")) + "\n\tITC: " + str(task.ITC) + "\n")
+                print(f"\n\tachU: {task.achU}\n\tachU (%): {task.getAchievedUtility():.2f}\n\tITC: {task.ITC}\n")
             else:
                 print("\n")
 
 
     # Draws the position of each task
+    # All the tasks are drawn as a single collection of circles; the returned patches are only the legend handles of the tasks
     def drawTasks(self, plot, fs):
-        cirs = []
-        for task in self.ltasks:
-            if (task.isCompleted()):
-                textcolor  = 'black'
-                pointcolor = 'black'
-            else:
-                textcolor  = 'blue'
-                pointcolor = 'red'
+        from matplotlib.patches import Patch
 
-            cir = plot.add_artist(plt.Circle((task.pos.X, task.pos.Y), radius=2.5, color=pointcolor))
-            cirs.append(cir)
+        completed   = (self.rET <= 0)
+        pointcolors = np.where(completed, 'black', 'red')
+        textcolors  = np.where(completed, 'black', 'blue')
+
+        drawCircles(plot, self.pos_xy, np.full(len(self.ltasks), 2.5), pointcolors)
+        for task, textcolor in zip(self.ltasks, textcolors):
             plot.text(task.pos.X, task.pos.Y+1.5*fs, str(task.id), color=textcolor, fontsize=fs, horizontalalignment='center', verticalalignment='center')
 
-        return(cirs)
+        return([Patch(color=pointcolor) for pointcolor in pointcolors])
 
 
     # Have all the tasks been completed?
     def areCompleted(self):
-        for task in self.ltasks:
-            if (not task.isCompleted()):
-                return(False)
-
-        return(True)
+        return(self.numCompleted == len(self.ltasks))
 
 
     # Returns the position of a given task
@@ -831,31 +1085,29 @@ class Tasks:
 
 
     # Returns the farthest deadline of the tasks which have not been completed yet
+    # Completed tasks never get work to do again, so the tasks skipped in dlOrder do not need to be checked any more
     def getFarthestDL(self):
-        farthestDL = -1
-        for task in self.ltasks:
-            if ((not task.isCompleted()) and (task.dl > farthestDL)):
-                farthestDL = task.dl
+        while ((self.farthestDLpos < len(self.dlOrder)) and (self.rET[self.dlOrder[self.farthestDLpos]] <= 0)):
+            self.farthestDLpos = self.farthestDLpos + 1
 
-        return(farthestDL)
+        if (self.farthestDLpos == len(self.dlOrder)):
+            return(-1)
+
+        return(int(self.dl[self.dlOrder[self.farthestDLpos]]))
 
 
     # Returns the minimum distance between two tasks
     def getMinDistance2Tasks(self):
-        minDistance = sys.float_info.max
-        for task1 in self.ltasks:
-            for task2 in self.ltasks:
-                if (task1.id != task2.id):
-                    Distance = task1.pos.getDistanceTo(task2.pos)
-                    if (Distance < minDistance):
-                        minDistance = Distance
+        if (len(self.ltasks) < 2):
+            return(sys.float_info.max)
 
-        return(minDistance)
+        dst, _ = self.kdtree.query(self.pos_xy, k=2) # The nearest neighbour of each task is the task itself
+        return(float(dst[:,1].min()))
 
 
     # Constructor
-    def __init__(self, numTasks, envSize, minDstBtwTasks, minTaskU, maxTaskU, minTaskET, maxTaskET, minTaskDL, maxTaskDL, maxAgentsPerTask):
-        self.createTasks(numTasks, envSize, minDstBtwTasks, minTaskU, maxTaskU, minTaskET, maxTaskET, minTaskDL, maxTaskDL, maxAgentsPerTask)
+    def __init__(self, numTasks, envSize, minDstBtwTasks, minTaskU, maxTaskU, minTaskET, maxTaskET, minTaskDL, maxTaskDL, maxAgentsPerTask, rng):
+        self.createTasks(numTasks, envSize, minDstBtwTasks, minTaskU, maxTaskU, minTaskET, maxTaskET, minTaskDL, maxTaskDL, maxAgentsPerTask, rng)
 
 
 ###############
@@ -865,6 +1117,7 @@ class Time:
 
     # ATTRIBUTES
     # curTime -> discrete current time
+    __slots__ = ('curTime',)
 
     # METHODS
     # Constructor
@@ -909,8 +1162,11 @@ class optMethod:
     # PIparamset          -> values for the set of parameters of the Physical Interference (PI) modeling function
     # changeTWT           -> can agents change the destination task when they are moving from one task to another?
     # rndSeed             -> seed value used to produce random numbers
+    # rng                 -> NumPy random number generator (PCG64) seeded with rndSeed; it produces all the random numbers of the simulation
     # AOtypeset           -> pair of Aggregation Operators (AO) to be applied
     # AOparamset          -> values for the set of parameters of the Aggregation Operator (AO)
+    # fig                 -> figure in which the snapshots are drawn (only in verbose mode)
+    # ax                  -> axes of the figure in which the snapshots are drawn (only in verbose mode)
 
     # METHODS
     # Constructor
@@ -923,37 +1179,43 @@ class optMethod:
         self.PItype              = PItype
         self.PIparamset          = PIparamset
         self.changeTWT           = changeTWT
-        rnd.seed(randomSeedValue)
         self.rndSeed             = randomSeedValue
+        self.rng                 = np.random.default_rng(randomSeedValue)
         self.AOtypeset           = AOtypeset
         self.AOparamset          = AOparamset        
         self.vbMode              = verboseMode
         self.clock               = Time()
         self.envSize             = XYtuple(envXSize, envYSize)
 
-        self.tasks  = Tasks(numTasks, self.envSize, minDstBtwTasks, minTaskU, maxTaskU, minTaskET, maxTaskET, minTaskDL, maxTaskDL, maxTaskA)
-        self.agents = Agents(numAgents, self.envSize, minAgentVel, minAgentWrkCap, maxAgentWrkCap, iniAgentPosX, iniAgentPosY, self.tasks, self.IN, self.INparamset, self.PI, self.PItype, self.PIparamset, self.changeTWT, self.AOtypeset, self.AOparamset, realexpMode)
+        self.tasks  = Tasks(numTasks, self.envSize, minDstBtwTasks, minTaskU, maxTaskU, minTaskET, maxTaskET, minTaskDL, maxTaskDL, maxTaskA, self.rng)
+        self.agents = Agents(numAgents, self.envSize, minAgentVel, minAgentWrkCap, maxAgentWrkCap, iniAgentPosX, iniAgentPosY, self.tasks, self.IN, self.INparamset, self.PI, self.PItype, self.PIparamset, self.changeTWT, self.AOtypeset, self.AOparamset, realexpMode, self.rng)
 
+        self.fig = None
+        self.ax  = None
         if (self.vbMode):
+            self.createSnapshotFigure()
             self.agents.printAgents(False)            
             self.tasks.printTasks(False)
 
 
     # Actions involved in an optimization step
+    # The current time does not change until the clock moves to the next instant, so it is read only once
     def optStep(self):
+        curTime = self.clock.getCurrentTime()
+        tasks   = self.tasks
 
         if (self.vbMode):
             self.clock.printCurrentTime()
-            self.drawSnapshot(12, self.clock.getCurrentTime())
+            self.drawSnapshot(12, curTime)
 
-        self.agents.doAgentsWork(self.tasks, self.clock.getCurrentTime())
+        self.agents.doAgentsWork(tasks, curTime)
 
-        if (self.tasks.areCompleted()):
+        if (tasks.areCompleted()):
             return(SIMstatus.SS_SUCCESSFULENDING)
-        elif (self.clock.getCurrentTime() > (self.simendRegFarthestDL*self.tasks.getFarthestDL())):
+        elif (curTime > (self.simendRegFarthestDL*tasks.getFarthestDL())):
             return(SIMstatus.SS_UNREASONABLETIME)
         else:
-            self.agents.moveAgents(self.tasks, self.clock.getCurrentTime())
+            self.agents.moveAgents(tasks, curTime)
             self.clock.nextInstant()
             return(SIMstatus.SS_INPROGRESS)
 
@@ -971,6 +1233,7 @@ class optMethod:
 
         if (self.vbMode):
             self.drawSnapshot(12, self.clock.getCurrentTime()+1)
+            self.closeSnapshotFigure()
             self.agents.printAgents(True)
             self.tasks.printTasks(True)
 
@@ -995,18 +1258,18 @@ class optMethod:
                 header = header + str(self.AOparamset[0]) + " "
             else:
                 for AOparam in self.AOparamset:
-                    header = header + str(format(AOparam, ".2f")).replace(".",",") + " "
+                    header = header + _fmt(AOparam, ".2f") + " "
 
         if (self.IN):
             header = header + "INp: "
             for INparam in self.INparamset:
-                header = header + str(format(INparam, ".2f")).replace(".",",") + " "
+                header = header + _fmt(INparam, ".2f") + " "
 
         if (self.PI):
             header = header + "PIt: " + self.PITypeToStr(self.PItype) + " "
             header = header + "PIp: "
             for PIparam in self.PIparamset:
-                header = header + str(format(PIparam, ".2f")).replace(".",",") + " "
+                header = header + _fmt(PIparam, ".2f") + " "
 
         if (self.changeTWT):
             header = header + "C: Y "
@@ -1017,23 +1280,45 @@ class optMethod:
         print("S: " + "{:5d}".format(self.rndSeed), end=' ')
 
         T = self.clock.getCurrentTime()
-        U = self.tasks.getAchievedUtility()
+        U, TbDL = self.tasks.getSummaryStats()
         print("T: " + "{:3d}".format(T), end=' ')
-        print("U: " + str(format(U, "6.2f")).replace(".",","), end=' ')
+        print("U: " + _fmt(U, "6.2f"), end=' ')
 
-        TbDL = self.tasks.getAchievedTimeBeforeDL()
-        print("TbDL: " + str(format(TbDL, "6.2f")).replace(".",","), end=' ')
+        print("TbDL: " + _fmt(TbDL, "6.2f"), end=' ')
 
         D = self.agents.getAchievedTravelledDST()
-        print("D: " + str(format(D, "8.2f")).replace(".",","))
+        print("D: " + _fmt(D, "8.2f"))
 
         return(header, SS, T, U, TbDL, D)
 
 
+    # Creates the figure in which all the snapshots are drawn
+    def createSnapshotFigure(self):
+        import matplotlib.pyplot as plt
+
+        self.fig, self.ax = plt.subplots(ncols=1)
+
+
+    # Closes the figure in which all the snapshots are drawn
+    def closeSnapshotFigure(self):
+        import matplotlib.pyplot as plt
+
+        plt.close(self.fig)
+        self.fig = None
+        self.ax  = None
+
+
     # Draws the current state of the optimization system
+    # The same figure is reused for all the snapshots; it is only created again if its window has been closed
     def drawSnapshot(self, fs, curTime):
+        import matplotlib.pyplot as plt
+
+        if ((self.fig is None) or (not plt.fignum_exists(self.fig.number))):
+            self.createSnapshotFigure()
 
-        fig, ax = plt.subplots(ncols=1)
+        fig = self.fig
+        ax  = self.ax
+        ax.cla()
         ax.set_title("SNAPSHOT #" + str(curTime), fontweight="bold", size=fs*2, pad=fs*2)
         ax.set_xlim([0, self.envSize.X-1])
         ax.set_ylim([0, self.envSize.Y-1])
@@ -1041,7 +1326,7 @@ class optMethod:
 
         cirs = self.tasks.drawTasks(ax, fs)
         lbls = self.agents.drawAgents(ax, fs*0.8, self.tasks.ltasks, curTime)
-        lgd = plt.legend(cirs, lbls, borderaxespad=0, loc='upper left', bbox_to_anchor=(1.1, 1.0)) 
+        lgd = ax.legend(cirs, lbls, borderaxespad=0, loc='upper left', bbox_to_anchor=(1.1, 1.0)) 
         plt.setp(lgd.texts, family='Courier New')
 
         plt.show()
@@ -1050,71 +1335,64 @@ class optMethod:
 
     # String conversion of the Aggregation Operator (AO) enum type
     def AOTypeToStr(self, AOtype):
-
-        if (AOtype is AOtypes.NONE):
-            return("")
-        elif (AOtype is AOtypes.TNORMA_MIN):
-            return("TNORMA_MIN")
-        elif (AOtype is AOtypes.TNORMA_MAX):
-            return("TNORMA_MAX")
-        elif (AOtype is AOtypes.TNORMA_PRODUCT):
-            return("TNORMA_PRODUCT")
-        elif (AOtype is AOtypes.TNORMA_YAGER):
-            return("TNORMA_YAGER")
-        elif (AOtype is AOtypes.HARMONIC_MEAN):
-            return("HARMONIC_MEAN")
-        else:
-            return("OWA_OPERATOR")
+        return(_AO_NAMES.get(AOtype, "OWA_OPERATOR"))
 
 
     # String conversion of the Physical Interference (PI) enum type
     def PITypeToStr(self, PItype):
-
-        if (PItype is PItypes.PI_LINEAR):
-            return("PI_LINEAR")
-        elif (PItype is PItypes.PI_TRAPEZOIDAL):
-            return("PI_TRAPEZOIDAL")
-        elif (PItype is PItypes.PI_GAUSSIAN):
-            return("PI_GAUSSIAN")
-        else:
-            return("PI_EXPONENTIAL")
+        return(_PI_NAMES.get(PItype, "PI_EXPONENTIAL"))
 
 
     # String conversion of the Simulation Status (SS) enum type
     def SIMStatusToStr(self, SS):
-
-        if (SS is SIMstatus.SS_INPROGRESS):
-            return("SS_INPROGRESS")
-        elif (SS is SIMstatus.SS_SUCCESSFULENDING):
-            return("SS_SUCCESSFULENDING")
-        else:
-            return("SS_UNREASONABLETIME")
+        return(_SS_NAMES.get(SS, "SS_UNREASONABLETIME"))
 
 
 ################
 # MAIN FUNCTION
 ################
-def main(printToFile, verboseMode, realexpMode, simendRegFarthestDL, envXSize, envYSize, numTasks, minDstBtwTasks, minTaskU, maxTaskU, minTaskET, maxTaskET, minTaskDL, maxTaskDL, maxTaskA, numAgents, minAgentVel, minAgentWrkCap, maxAgentWrkCap, iniAgentPosX = None, iniAgentPosY = None):
-
-    start_time = datetime.now()
-    if (printToFile):
-        print("Print to file ACTIVATED!\n\n");
-        default_stdout = sys.stdout
-        filename       = datetime.now().strftime("%Y%m%d_%H%M%S.log")
-        sys.stdout     = open(filename, 'w')
-        
-        csvname  = datetime.now().strftime("%Y%m%d_%H%M%S.csv")
-        csvname   = "datos_"+csvname
-        row      = ["IN", "PI", "At", "Ap", "INp", "PIt", "PIp", "C", "S", "ForcedEND", "T", "U", "TbDL", "D"]
-        with open(csvname, "w") as f:
-            writer = csv.writer(f, delimiter =';')
-            writer.writerow(row)
-
-    lT    = np.empty(__RandomSeedValues__[1]+1-__RandomSeedValues__[0], dtype='uint32')
-    lU    = np.empty(__RandomSeedValues__[1]+1-__RandomSeedValues__[0])
-    lTbDL = np.empty(__RandomSeedValues__[1]+1-__RandomSeedValues__[0])
-    lD    = np.empty(__RandomSeedValues__[1]+1-__RandomSeedValues__[0])
 
+# Runs one simulation, i.e. the optimization method with the given arguments
+# The output of the simulation is captured and returned along with its results, so that the outputs of the simulations
+# run in parallel can be printed in the same order as if they were run one after another
+def runSimulation(optMethodArgs):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        M = optMethod(*optMethodArgs)
+        results = M.execute()
+    return(output.getvalue(), results)
+
+
+# Runs all the simulations, whose outputs and results are returned, in the same order as the simulations, as soon as they are available
+# The simulations are independent, so they are distributed among as many processes as CPUs. In verbose mode, however,
+# they are run one after another by the main process, which draws the snapshots of each simulation and prints its output
+# as it goes, so there is no output to be returned
+def runSimulations(simulations, verboseMode):
+    if (verboseMode):
+        return(("", optMethod(*optMethodArgs).execute()) for optMethodArgs in simulations)
+    else:
+        return(runSimulationsInParallel(simulations))
+
+
+# Runs the simulations in as many processes as CPUs and yields their outputs and results in the same order as the simulations
+# The results are yielded while the rest of simulations are still running, so that those already finished are not lost if
+# the sweep is interrupted; in that case, the simulations that have not started yet are cancelled
+# The processes are always started with the "spawn" method, as on Windows, because forking a process that has already
+# used matplotlib or Numba is not safe
+def runSimulationsInParallel(simulations):
+    numProcesses = os.cpu_count() or 1 # The number of CPUs may not be determinable
+    chunkSize    = max(1, min(len(simulations) // (4*numProcesses), 10)) # Small chunks, so that the results come back steadily
+    executor     = ProcessPoolExecutor(numProcesses, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        yield from executor.map(runSimulation, simulations, chunksize=chunkSize)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Returns the list of all the combinations of settings to be simulated, as (IN, INparamset, PI, PItype, PIparamset, changeTWT, AOtypeset, AOparamset) tuples
+# The lists of parameter sets of the Aggregation Operators (AO) and Physical Interference (PI) are paired with their types by position
+def settingsCombinations():
+    combinations = []
     for IN in __Inertia__:
         if (IN):
             __INparams = __INparams__
@@ -1143,48 +1421,77 @@ def main(printToFile, verboseMode, realexpMode, simendRegFarthestDL, envXSize, e
                     __PIparams = [[[None, None]]]
                     __AOparams = AOparams__
 
-                i = 0
-                for AOtypeset in __AOtypes:
-                    AOparams = __AOparams[i]
-                    i = i + 1
-
-                    for AOparamset in AOparams:
-                        j = 0
-                        for PItype in __PItypes:
-                            PIparams = __PIparams[j]
-                            j = j + 1
-
-                            for PIparamset in PIparams:
-                                for changeTWT in __ChangeTaskWhileTravelling__:
-                                    cForcedEnd = 0
-                                    randomSeedRange = range(__RandomSeedValues__[0], __RandomSeedValues__[1]+1)
-                                    for randomSeedValue in randomSeedRange:
-                                        M = optMethod(realexpMode, simendRegFarthestDL, IN, INparamset, PI, PItype, PIparamset, changeTWT, randomSeedValue, AOtypeset, AOparamset, verboseMode, envXSize, envYSize, numTasks, minDstBtwTasks, minTaskU, maxTaskU, minTaskET, maxTaskET, minTaskDL, maxTaskDL, maxTaskA, numAgents, minAgentVel, minAgentWrkCap, maxAgentWrkCap, iniAgentPosX, iniAgentPosY)
-                                        H, SS, T, U, TbDL, D = M.execute()
-                                        if (SS is SIMstatus.SS_UNREASONABLETIME):
-                                            cForcedEnd = cForcedEnd + 1
-                                        lT   [randomSeedValue-__RandomSeedValues__[0]] = T
-                                        lU   [randomSeedValue-__RandomSeedValues__[0]] = U
-                                        lTbDL[randomSeedValue-__RandomSeedValues__[0]] = TbDL
-                                        lD   [randomSeedValue-__RandomSeedValues__[0]] = D
-                                        
-                                        if(printToFile):
-                                            row = [IN, PI, AOtypeset, AOparamset, INparamset, PItype, PIparamset, changeTWT, randomSeedValue, cForcedEnd, T, U, TbDL, D]
-                                            with open(csvname, "a") as f:
-                                                writer = csv.writer(f, delimiter =';')
-                                                writer.writerow(row)
-
-                                    print("#" + H)
-                                    print("#forcedEND: " + "{:4d}".format(cForcedEnd))
-                                    print("#avgT:      " + str(format(np.mean(lT),    "6.2f")).replace(".",",") + " stdT:    " + str(format(np.std(lT),    "6.2f")).replace(".",",") + " varT:    " + str(format(np.var(lT),    "6.2f")).replace(".",","))
-                                    print("#avgU:      " + str(format(np.mean(lU),    "6.2f")).replace(".",",") + " stdU:    " + str(format(np.std(lU),    "6.2f")).replace(".",",") + " varU:    " + str(format(np.var(lU),    "6.2f")).replace(".",","))
-                                    print("#avgTbDL:   " + str(format(np.mean(lTbDL), "6.2f")).replace(".",",") + " stdTbDL: " + str(format(np.std(lTbDL), "6.2f")).replace(".",",") + " varTbDL: " + str(format(np.var(lTbDL), "6.2f")).replace(".",","))
-                                    print("#avgD:      " + str(format(np.mean(lD),    "8.2f")).replace(".",",") + " stdD:    " + str(format(np.std(lD),    "8.2f")).replace(".",",") + " varD:    " + str(format(np.var(lD),    "8.2f")).replace(".",","))
-                                    print("#")
-                                    # To extract these average results from the output file, you should execute the following console command:
-                                    # findstr # filename.log >> res.log
+                combinations.extend((IN, INparamset, PI, PItype, PIparamset, changeTWT, AOtypeset, AOparamset)
+                                    for AOtypeset, AOparams in zip(__AOtypes, __AOparams)
+                                    for AOparamset in AOparams
+                                    for PItype, PIparams in zip(__PItypes, __PIparams)
+                                    for PIparamset in PIparams
+                                    for changeTWT in __ChangeTaskWhileTravelling__)
+
+    return(combinations)
+
+
+def main(printToFile, verboseMode, realexpMode, simendRegFarthestDL, envXSize, envYSize, numTasks, minDstBtwTasks, minTaskU, maxTaskU, minTaskET, maxTaskET, minTaskDL, maxTaskDL, maxTaskA, numAgents, minAgentVel, minAgentWrkCap, maxAgentWrkCap, iniAgentPosX = None, iniAgentPosY = None):
+
+    start_time = datetime.now()
+    if (printToFile):
+        print("Print to file ACTIVATED!\n\n");
+        default_stdout = sys.stdout
+        timestamp      = start_time.strftime("%Y%m%d_%H%M%S") # Both files are named after the same time instant
+        filename       = timestamp + ".log"
+        sys.stdout     = open(filename, 'w')
+        
+        csvname   = "datos_" + timestamp + ".csv"
+        csvfile   = open(csvname, "w") # The CSV file is kept open during the whole sweep
+        csvwriter = csv.writer(csvfile, delimiter =';')
+        row       = ["IN", "PI", "At", "Ap", "INp", "PIt", "PIp", "C", "S", "ForcedEND", "T", "U", "TbDL", "D"]
+        csvwriter.writerow(row)
+
+    lT    = np.empty(__RandomSeedValues__[1]+1-__RandomSeedValues__[0], dtype='uint32')
+    lU    = np.empty(__RandomSeedValues__[1]+1-__RandomSeedValues__[0])
+    lTbDL = np.empty(__RandomSeedValues__[1]+1-__RandomSeedValues__[0])
+    lD    = np.empty(__RandomSeedValues__[1]+1-__RandomSeedValues__[0])
+
+    # All the combinations of settings are gathered first, so that their simulations can be run in parallel
+    combinations = settingsCombinations()
+
+    randomSeedRange = range(__RandomSeedValues__[0], __RandomSeedValues__[1]+1)
+    simulations = [(realexpMode, simendRegFarthestDL, IN, INparamset, PI, PItype, PIparamset, changeTWT, randomSeedValue, AOtypeset, AOparamset, verboseMode, envXSize, envYSize, numTasks, minDstBtwTasks, minTaskU, maxTaskU, minTaskET, maxTaskET, minTaskDL, maxTaskDL, maxTaskA, numAgents, minAgentVel, minAgentWrkCap, maxAgentWrkCap, iniAgentPosX, iniAgentPosY)
+                   for (IN, INparamset, PI, PItype, PIparamset, changeTWT, AOtypeset, AOparamset) in combinations
+                   for randomSeedValue in randomSeedRange]
+    results = runSimulations(simulations, verboseMode)
+
+    for (IN, INparamset, PI, PItype, PIparamset, changeTWT, AOtypeset, AOparamset) in combinations:
+        cForcedEnd = 0
+        for randomSeedValue in randomSeedRange:
+            output, (H, SS, T, U, TbDL, D) = next(results)
+            print(output, end='')
+            if (SS is SIMstatus.SS_UNREASONABLETIME):
+                cForcedEnd = cForcedEnd + 1
+            lT   [randomSeedValue-__RandomSeedValues__[0]] = T
+            lU   [randomSeedValue-__RandomSeedValues__[0]] = U
+            lTbDL[randomSeedValue-__RandomSeedValues__[0]] = TbDL
+            lD   [randomSeedValue-__RandomSeedValues__[0]] = D
+            
+            if(printToFile):
+                row = [IN, PI, AOtypeset, AOparamset, INparamset, PItype, PIparamset, changeTWT, randomSeedValue, cForcedEnd, T, U, TbDL, D]
+                csvwriter.writerow(row)
+
+        if(printToFile):
+            csvfile.flush() # The rows of each combination of settings reach the file before its averages are printed
+
+        print("#" + H)
+        print("#forcedEND: " + "{:4d}".format(cForcedEnd))
+        print("#avgT:      " + _fmt(np.mean(lT),    "6.2f") + " stdT:    " + _fmt(np.std(lT),    "6.2f") + " varT:    " + _fmt(np.var(lT),    "6.2f"))
+        print("#avgU:      " + _fmt(np.mean(lU),    "6.2f") + " stdU:    " + _fmt(np.std(lU),    "6.2f") + " varU:    " + _fmt(np.var(lU),    "6.2f"))
+        print("#avgTbDL:   " + _fmt(np.mean(lTbDL), "6.2f") + " stdTbDL: " + _fmt(np.std(lTbDL), "6.2f") + " varTbDL: " + _fmt(np.var(lTbDL), "6.2f"))
+        print("#avgD:      " + _fmt(np.mean(lD),    "8.2f") + " stdD:    " + _fmt(np.std(lD),    "8.2f") + " varD:    " + _fmt(np.var(lD),    "8.2f"))
+        print("#")
+        # To extract these average results from the output file, you should execute the following console command:
+        # findstr # filename.log >> res.log
 
     if (printToFile):
+        csvfile.close()
         sys.stdout.close()
         sys.stdout = default_stdout
 
@@ -1197,26 +1504,28 @@ def main(printToFile, verboseMode, realexpMode, simendRegFarthestDL, envXSize, e
 # MAIN PROGRAM
 ###############
 
-main(__PrintToFile__,
-     __VerboseMode__,
-     __RealExpMode__,
-     __SimEndRegFarthestDL__,
-     __EnvXSize__,
-     __EnvYSize__,
-
-     __NumTasks__,
-     __MinDstBtwTasks__,
-     __MinTaskU__,
-     __MaxTaskU__,
-     __MinTaskET__,
-     __MaxTaskET__,
-     __MinTaskDL__,
-     __MaxTaskDL__,
-     __MaxTaskA__,
-
-     __NumAgents__,
-     __MinAgentVel__,
-     __MinAgentWrkCap__,
-     __MaxAgentWrkCap__,
-     __IniAgentPosX__,
-     __IniAgentPosY__)
+# The main program must only run when the script is executed, and not when the processes running the simulations import it
+if __name__ == "__main__":
+    main(__PrintToFile__,
+         __VerboseMode__,
+         __RealExpMode__,
+         __SimEndRegFarthestDL__,
+         __EnvXSize__,
+         __EnvYSize__,
+
+         __NumTasks__,
+         __MinDstBtwTasks__,
+         __MinTaskU__,
+         __MaxTaskU__,
+         __MinTaskET__,
+         __MaxTaskET__,
+         __MinTaskDL__,
+         __MaxTaskDL__,
+         __MaxTaskA__,
+
+         __NumAgents__,
+         __MinAgentVel__,
+         __MinAgentWrkCap__,
+         __MaxAgentWrkCap__,
+         __IniAgentPosX__,
+         __IniAgentPosY__)